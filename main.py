@@ -1,16 +1,25 @@
 import os
 import time
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone, date
-from typing import Dict, List, Tuple
+from collections import deque
 from random import uniform
+from typing import Dict, List, Tuple
 
+import httplib2
+import orjson
 import requests
-from icalevents.icalevents import events as ical_fetch_events
-from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+
+from storage import write_json_atomic
 
 # Environment
 ICS_URL = os.environ.get("ICS_URL")
@@ -20,6 +29,11 @@ LOOKBACK_DAYS = int(os.environ.get("SYNC_LOOKBACK_DAYS", "1"))
 POLL_SECONDS = int(os.environ.get("POLL_SECONDS", "900"))
 SUMMARY_PREFIX = os.environ.get("SUMMARY_PREFIX", "[School]").strip()
 BUSY_BLOCKERS = os.environ.get("BUSY_BLOCKERS", "false").lower() == "true"
+# Google Calendar API quota: requests per minute per user
+GCAL_RPM = int(os.environ.get("GCAL_RPM", "600"))
+# Upper bound on concurrent batch requests and the latency the AIMD controller aims for
+GCAL_MAX_CONCURRENCY = int(os.environ.get("GCAL_MAX_CONCURRENCY", "8"))
+GCAL_TARGET_LATENCY_MS = int(os.environ.get("GCAL_TARGET_LATENCY_MS", "400"))
 
 DATA_DIR = os.path.abspath("./data")
 CREDS_DIR = os.path.abspath("./credentials")
@@ -29,6 +43,14 @@ CREDENTIALS_PATH = os.path.join(CREDS_DIR, "credentials.json")
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Google caps a single batch HTTP request at 50 calls
+BATCH_SIZE = 50
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CANCELLED_STATUSES = ("CANCELLED", "CANCELED")
+# Number of sub-ranges the sync window is split into when listing existing events
+LIST_PARTS = 4
+
 assert ICS_URL, "ICS_URL is required"
 
 def now_utc():
@@ -36,14 +58,26 @@ def now_utc():
 
 def load_state():
     if os.path.exists(STATE_PATH):
-        with open(STATE_PATH, "r") as f:
-            return json.load(f)
+        with open(STATE_PATH, "rb") as f:
+            return orjson.loads(f.read())
     return {"last_run": None}
 
 def save_state(state):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(STATE_PATH, "w") as f:
-        json.dump(state, f)
+    write_json_atomic(STATE_PATH, state)
+
+# Keep-alive session for the OAuth endpoints; urllib3 retries transient failures with backoff
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=None,
+        raise_on_status=False,
+    ),
+))
 
 def run_device_flow() -> Credentials:
     with open(CREDENTIALS_PATH, "r") as f:
@@ -59,7 +93,7 @@ def run_device_flow() -> Credentials:
     print(f"[auth] Requesting device code with scopes: {SCOPES}")
     
     payload = {"client_id": client_id, "scope": " ".join(SCOPES)}
-    resp = requests.post("https://oauth2.googleapis.com/device/code", data=payload, timeout=30)
+    resp = _session.post("https://oauth2.googleapis.com/device/code", data=payload, timeout=30)
     
     if resp.status_code != 200:
         print(f"[auth] Error response: {resp.status_code} - {resp.text}")
@@ -78,11 +112,26 @@ def run_device_flow() -> Credentials:
     }
     
     interval = device_data.get("interval", 5)
+    # RFC 8628: the device code is only valid for expires_in seconds
+    deadline = time.monotonic() + device_data.get("expires_in", 1800)
+    wait = interval
     while True:
-        time.sleep(interval)
-        token_resp = requests.post("https://oauth2.googleapis.com/token", data=token_payload, timeout=30)
-        if token_resp.status_code == 200:
+        if time.monotonic() + wait > deadline:
+            raise TimeoutError("Device code expired before authorization was completed")
+        # Jitter upwards only; polling faster than `interval` earns a slow_down
+        time.sleep(wait * uniform(1.0, 1.2))
+        try:
+            token_resp = _session.post("https://oauth2.googleapis.com/token", data=token_payload, timeout=30)
+            if token_resp.status_code == 429 or token_resp.status_code >= 500:
+                raise requests.HTTPError(f"HTTP {token_resp.status_code}", response=token_resp)
             token_data = token_resp.json()
+        except (requests.RequestException, ValueError) as exc:
+            # Network errors, exhausted urllib3 retries and non-JSON bodies all back off the same way
+            wait = min(60, wait * 2)
+            print(f"[auth] Token poll failed ({exc}), retrying in {wait}s")
+            continue
+        wait = interval
+        if token_resp.status_code == 200:
             creds = Credentials(
                 token=token_data["access_token"],
                 refresh_token=token_data.get("refresh_token"),
@@ -92,16 +141,22 @@ def run_device_flow() -> Credentials:
                 scopes=SCOPES,
             )
             return creds
-        error = token_resp.json().get("error")
+        error = token_data.get("error")
         if error == "authorization_pending":
             continue
         if error == "slow_down":
+            # RFC 8628 3.5: increase the interval by 5 seconds for this and all later polls
             interval += 5
+            wait = interval
             continue
+        if error == "expired_token":
+            raise TimeoutError("Device code expired before authorization was completed")
         raise RuntimeError(f"Device auth failed: {error}")
 
 
 def get_gcal_service():
+    from googleapiclient.discovery import build
+
     creds = None
     if os.path.exists(TOKEN_PATH):
         creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
@@ -119,12 +174,22 @@ def get_gcal_service():
         os.makedirs(DATA_DIR, exist_ok=True)
         with open(TOKEN_PATH, "w") as token:
             token.write(creds.to_json())
-    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+    # Use the discovery document bundled with google-api-python-client instead of fetching it
+    return build("calendar", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+
+def ensure_service(service=None):
+    """Return `service` while its credentials are valid, otherwise build a fresh one."""
+    if service is None or not service._http.credentials.valid:
+        return get_gcal_service()
+    return service
 
 def iso(dt: datetime) -> str:
+    # Google ignores sub-second precision, and already-UTC values need no conversion
+    if dt.tzinfo is timezone.utc:
+        return dt.isoformat(timespec="seconds")
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).isoformat()
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
 
 def event_key(uid: str, start: datetime | date, all_day: bool) -> str:
     # Stable key per occurrence. All-day events key off their local date to avoid TZ drift.
@@ -132,7 +197,7 @@ def event_key(uid: str, start: datetime | date, all_day: bool) -> str:
         fragment = start.date().isoformat() if isinstance(start, datetime) else start.isoformat()
     else:
         fragment = iso(start if isinstance(start, datetime) else datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc))
-    return f"{uid}|{fragment}"
+    return uid + "|" + fragment
 
 def normalize_event_times(ics_ev) -> Tuple[datetime, datetime, bool]:
     """Return timezone-aware start/end along with all-day flag."""
@@ -169,58 +234,302 @@ def normalize_event_times(ics_ev) -> Tuple[datetime, datetime, bool]:
 
     return start_dt, end_dt, all_day
 
-def fetch_ics_window(start: datetime, end: datetime):
-    return ical_fetch_events(url=ICS_URL, start=start.date(), end=end.date())
+ICS_CHUNK_SIZE = 64 * 1024
+# Last downloaded feed and the events parsed from it, keyed by the date window
+_ics_cache = {"etag": None, "last_modified": None, "digest": None, "content": None, "window": None, "events": None}
 
-def execute_with_backoff(request, operation: str, max_retries: int = 5):
-    """Execute a Google API request with exponential backoff on rate limit errors."""
-    for attempt in range(max_retries):
+def fetch_ics_window(start: datetime, end: datetime):
+    """Return expanded ICS events in the window, reusing the last parse when the feed is unchanged."""
+    headers = {}
+    if _ics_cache["content"] is not None:
+        if _ics_cache["etag"]:
+            headers["If-None-Match"] = _ics_cache["etag"]
+        if _ics_cache["last_modified"]:
+            headers["If-Modified-Since"] = _ics_cache["last_modified"]
+
+    url = "https://" + ICS_URL[len("webcal://"):] if ICS_URL.startswith("webcal://") else ICS_URL
+    window = (start.date(), end.date())
+    with requests.get(url, headers=headers, timeout=60, stream=True) as resp:
+        if resp.status_code == 304:
+            unchanged = True
+        else:
+            resp.raise_for_status()
+            # Stream the body and hash it as it arrives. The cache holds the raw bytes
+            # (icalevents decodes them itself), so at most the cached feed plus one
+            # download buffer are in memory, and an unchanged feed is simply discarded.
+            body = bytearray()
+            digest = hashlib.blake2b(digest_size=16)
+            for chunk in resp.iter_content(chunk_size=ICS_CHUNK_SIZE):
+                body += chunk
+                digest.update(chunk)
+            unchanged = digest.digest() == _ics_cache["digest"]
+            _ics_cache["etag"] = resp.headers.get("ETag")
+            _ics_cache["last_modified"] = resp.headers.get("Last-Modified")
+            if not unchanged:
+                # Keep the download buffer itself rather than copying it
+                _ics_cache["content"] = body
+                _ics_cache["digest"] = digest.digest()
+            del body
+    if unchanged and _ics_cache["window"] == window:
+        return _ics_cache["events"]
+
+    # icalevents expands recurrences, so filtering still goes through its parser.
+    # Imported lazily: it pulls in a sizeable dependency tree only the sync needs.
+    from icalevents.icalevents import events as ical_fetch_events
+    # Invalidate first so a parse failure can't leave the old window paired with no events
+    _ics_cache["window"] = None
+    _ics_cache["events"] = None
+    events = ical_fetch_events(string_content=_ics_cache["content"], start=window[0], end=window[1])
+    _ics_cache["window"] = window
+    _ics_cache["events"] = events
+    return events
+
+class TokenBucket:
+    """Sliding-window limiter: at most `capacity` calls in any `period` seconds."""
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = max(1, capacity)
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self, n: int = 1):
+        n = min(n, self.capacity)
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) + n <= self.capacity:
+                    self.calls.extend([now] * n)
+                    return
+                # Sleep until enough of the oldest calls fall out of the window
+                time.sleep(self.calls[len(self.calls) + n - self.capacity - 1] + self.period - now)
+
+class AIMDController:
+    """Concurrency limit that adapts like TCP congestion control.
+
+    Every `window` successful calls with mean per-unit latency under
+    `target_latency` raise the limit by 0.5; a throttled call (429/5xx) halves
+    it. A batch counts as `cost` units, so its round-trip time is divided by
+    the number of sub-requests it carried.
+    """
+
+    def __init__(self, initial: float = 4, maximum: int = 8, target_latency: float = 0.4, window: int = 20):
+        self.maximum = max(1, maximum)
+        self.limit = min(float(initial), self.maximum)
+        self.target_latency = target_latency
+        self.latencies = deque(maxlen=window)
+        self.active = 0
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        with self.cond:
+            while self.active >= int(self.limit):
+                self.cond.wait()
+            self.active += 1
+
+    def release(self, latency: float, throttled: bool = False, cost: int = 1):
+        with self.cond:
+            self.active -= 1
+            if throttled:
+                self.backoff()
+            else:
+                self.latencies.append(latency / max(1, cost))
+                if len(self.latencies) == self.latencies.maxlen:
+                    if sum(self.latencies) / len(self.latencies) <= self.target_latency:
+                        self.limit = min(self.maximum, self.limit + 0.5)
+                    self.latencies.clear()
+            self.cond.notify_all()
+
+    def backoff(self):
+        with self.cond:
+            self.limit = max(1.0, self.limit * 0.5)
+            self.latencies.clear()
+
+bucket = TokenBucket(GCAL_RPM)
+aimd = AIMDController(maximum=GCAL_MAX_CONCURRENCY, target_latency=GCAL_TARGET_LATENCY_MS / 1000)
+_thread_state = threading.local()
+
+def thread_http(service):
+    """httplib2 is not thread-safe, so each worker thread gets its own authorized connection."""
+    creds = service._http.credentials
+    if getattr(_thread_state, "creds", None) is not creds:
+        _thread_state.creds = creds
+        _thread_state.http = AuthorizedHttp(creds, http=httplib2.Http(timeout=60))
+    return _thread_state.http
+
+def is_rate_limit_error(e: HttpError) -> bool:
+    # Handle both 429 (Too Many Requests) and 403 (rateLimitExceeded)
+    return e.resp.status == 429 or (e.resp.status == 403 and 'rateLimitExceeded' in str(e))
+
+def is_throttle_error(e: HttpError) -> bool:
+    # Signals the AIMD controller should back off on: rate limits, server errors,
+    # or an exhausted quota reported via X-RateLimit-Remaining where Google sends it
+    return (
+        is_rate_limit_error(e)
+        or e.resp.status >= 500
+        or e.resp.get("x-ratelimit-remaining") == "0"
+    )
+
+def is_retryable_error(e: HttpError) -> bool:
+    return e.resp.status in RETRY_STATUSES or is_rate_limit_error(e)
+
+def is_retryable_for(kind: str, e: HttpError) -> bool:
+    # A 5xx on insert may still have created the event, and retrying would mirror it twice.
+    # Rate-limit errors mean the call was not processed, so those are safe for every kind.
+    if kind == "create":
+        return is_rate_limit_error(e)
+    return is_retryable_error(e)
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with jitter for the given 1-based attempt number."""
+    return min(cap, base * (2 ** (attempt - 1)) * uniform(0.5, 1.5))
+
+def _retry(fn, operation: str, max_attempts: int = 5, base: float = 1.0, cap: float = 60.0,
+           retryable=is_retryable_error):
+    """Call `fn`, retrying rate-limit and transient server errors with jittered backoff.
+
+    `retryable` decides which HttpErrors are retried. A Retry-After header, when
+    present, is used as a floor for the delay.
+    """
+    for attempt in range(1, max_attempts + 1):
         try:
-            result = request.execute()
-            return result
+            return fn()
         except HttpError as e:
-            # Handle both 429 (Too Many Requests) and 403 (rateLimitExceeded)
-            is_rate_limit = (
-                e.resp.status == 429 or 
-                (e.resp.status == 403 and 'rateLimitExceeded' in str(e))
-            )
-            
-            if is_rate_limit and attempt < max_retries - 1:
-                # Exponential backoff: 2, 4, 8, 16 seconds
-                wait_time = 2 ** (attempt + 1)
-                retry_after = int(e.resp.get('retry-after', wait_time))
-                wait = max(wait_time, retry_after)
-                print(f"[warn] Rate limit hit during {operation} (attempt {attempt + 1}/{max_retries}), waiting {wait}s")
-                time.sleep(wait)
-                continue
-            raise
-    raise RuntimeError(f"Failed {operation} after {max_retries} retries")
-
-def list_existing_mirrors(service, time_min: str, time_max: str) -> List[Dict]:
+            if not retryable(e) or attempt == max_attempts:
+                raise
+            delay = backoff_delay(attempt, base, cap)
+            try:
+                delay = max(delay, float(e.resp.get("retry-after", 0)))
+            except ValueError:
+                pass
+            print(f"[warn] HTTP {e.resp.status} during {operation} (attempt {attempt}/{max_attempts}), waiting {delay:.1f}s")
+            time.sleep(delay)
+
+def execute_paced(request, cost: int = 1, http=None):
+    """Execute a Google API request under the rate limiter and AIMD controller.
+
+    `cost` is the number of quota units the request consumes (sub-requests for a batch).
+    """
+    bucket.acquire(cost)
+    aimd.acquire()
+    started = time.monotonic()
+    throttled = False
+    try:
+        return request.execute(http=http)
+    except HttpError as e:
+        throttled = is_throttle_error(e)
+        raise
+    finally:
+        aimd.release(time.monotonic() - started, throttled, cost)
+
+def list_mirrors_range(service, time_min: str, time_max: str) -> List[Dict]:
     items = []
     page_token = None
+    http = thread_http(service)
     while True:
-        resp = execute_with_backoff(
-            service.events().list(
-                calendarId=GOOGLE_CALENDAR_ID,
-                privateExtendedProperty=["ics_bridge=true"],
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=2500,
-                singleEvents=True,
-                pageToken=page_token,
-                showDeleted=False,
-                orderBy="startTime",
-            ),
-            "list events"
+        request = service.events().list(
+            calendarId=GOOGLE_CALENDAR_ID,
+            privateExtendedProperty=["ics_bridge=true"],
+            timeMin=time_min,
+            timeMax=time_max,
+            maxResults=2500,
+            singleEvents=True,
+            pageToken=page_token,
+            showDeleted=False,
+            orderBy="startTime",
         )
+        resp = _retry(lambda: execute_paced(request, http=http), "list events")
         items.extend(resp.get("items", []))
         page_token = resp.get("nextPageToken")
         if not page_token:
             break
-        time.sleep(uniform(0.2, 0.5))
     return items
 
+def list_existing_mirrors(service, window_start: datetime, window_end: datetime, parts: int = LIST_PARTS) -> List[Dict]:
+    """List mirrored events by splitting the window into sub-ranges fetched in parallel."""
+    step = (window_end - window_start) / parts
+    bounds = [window_start + step * i for i in range(parts)] + [window_end]
+    with ThreadPoolExecutor(max_workers=parts) as pool:
+        results = pool.map(
+            lambda r: list_mirrors_range(service, iso(r[0]), iso(r[1])),
+            zip(bounds, bounds[1:]),
+        )
+        # Events spanning a sub-range boundary come back twice
+        by_id: Dict[str, Dict] = {}
+        for part in results:
+            for ge in part:
+                by_id.setdefault(ge["id"], ge)
+    return list(by_id.values())
+
+def execute_batched(service, ops: List[Tuple[str, str, object]], max_retries: int = 5) -> Dict[str, int]:
+    """Send (kind, key, request) mutations in batches of up to BATCH_SIZE.
+
+    Batches are dispatched from a thread pool; the AIMD controller decides how
+    many are in flight at once. Sub-requests that hit a rate limit or server
+    error are collected and retried in a later round with jittered backoff;
+    creates are only retried on rate limits (see is_retryable_for). Other
+    failures are logged and skipped. Returns success counts per kind.
+    """
+    counts = {"create": 0, "update": 0, "delete": 0, "backfill": 0}
+    counts_lock = threading.Lock()
+    pending = ops
+    for attempt in range(max_retries):
+        retry: List[Tuple[str, str, object]] = []
+
+        def _send(chunk: Dict[str, Tuple[str, str, object]]):
+            throttled = []
+
+            def _cb(request_id, response, exception):
+                kind = chunk[request_id][0]
+                if exception is None:
+                    with counts_lock:
+                        counts[kind] += 1
+                elif isinstance(exception, HttpError) and is_retryable_for(kind, exception):
+                    throttled.append(request_id)
+                    retry.append(chunk[request_id])
+                else:
+                    if isinstance(exception, HttpError) and is_throttle_error(exception):
+                        throttled.append(request_id)
+                    print(f"[warn] {kind} failed for {request_id}: {exception}")
+
+            batch = service.new_batch_http_request(callback=_cb)
+            for kind, k, req in chunk.values():
+                batch.add(req, request_id=k)
+            try:
+                http = thread_http(service)
+                _retry(
+                    lambda: execute_paced(batch, cost=len(chunk), http=http),
+                    f"batch of {len(chunk)} mutations",
+                    # A failed batch may have been partly applied, so creates only retry on rate limits
+                    retryable=lambda e: all(is_retryable_for(kind, e) for kind, _, _ in chunk.values()),
+                )
+            except Exception as e:
+                print(f"[warn] batch failed ({len(chunk)} mutations): {e}")
+            # One congestion signal per batch, however many of its sub-requests were throttled
+            if throttled:
+                aimd.backoff()
+
+        chunks = [
+            {k: (kind, k, req) for kind, k, req in pending[i:i + BATCH_SIZE]}
+            for i in range(0, len(pending), BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=aimd.maximum) as pool:
+            list(pool.map(_send, chunks))
+
+        if not retry:
+            break
+        if attempt < max_retries - 1:
+            wait = backoff_delay(attempt + 1)
+            print(f"[warn] {len(retry)} mutations throttled (attempt {attempt + 1}/{max_retries}), retrying in {wait:.1f}s")
+            time.sleep(wait)
+        pending = retry
+    else:
+        for kind, k, _ in pending:
+            print(f"[warn] {kind} failed for {k}: still throttled after {max_retries} attempts")
+    return counts
+
 def gcal_event_from_ics(ics_ev, key: str, start_dt: datetime, end_dt: datetime, all_day: bool) -> Dict:
     # Title handling
     summary = ics_ev.summary or "School event"
@@ -278,7 +587,12 @@ def gcal_event_from_ics(ics_ev, key: str, start_dt: datetime, end_dt: datetime,
         email = organizer.replace("mailto:", "").strip() if isinstance(organizer, str) else None
         if email and "@" in email:
             body["organizer"] = {"email": email, "displayName": email.split("@")[0]}
-    
+
+    # Fingerprint of everything we send, so unchanged events can be skipped without a field diff
+    body["extendedProperties"]["private"]["ics_hash"] = hashlib.blake2b(
+        orjson.dumps(body, option=orjson.OPT_SORT_KEYS), digest_size=12
+    ).hexdigest()
+
     return body
 
 def compare_relevant(a: Dict, b: Dict) -> bool:
@@ -296,8 +610,29 @@ def compare_relevant(a: Dict, b: Dict) -> bool:
             return False
     return True
 
-def sync_once():
-    service = get_gcal_service()
+def _wanted_iter(ics_events, ws: datetime, we: datetime):
+    """Yield (key, body) for live ICS events overlapping [ws, we], skipping others before building a body."""
+    for ev in ics_events:
+        status = getattr(ev, "status", None)
+        # Feeds normally send upper-case statuses; only fall back to .upper() when they don't
+        if status and (status in CANCELLED_STATUSES or status.upper() in CANCELLED_STATUSES):
+            continue
+        uid = getattr(ev, "uid", None) or getattr(ev, "id", None) or ""
+        try:
+            start_dt, end_dt, all_day = normalize_event_times(ev)
+        except Exception as exc:
+            print(f"[warn] skipping event without usable times ({uid}): {exc}")
+            continue
+
+        # Only sync events that overlap the window (past events and far-future expansions are dropped)
+        if end_dt < ws or start_dt > we:
+            continue
+
+        key = event_key(uid, start_dt.date() if all_day else start_dt, all_day)
+        yield key, gcal_event_from_ics(ev, key, start_dt, end_dt, all_day)
+
+def sync_once(service=None):
+    service = ensure_service(service)
 
     # Only look forward to avoid deleting/recreating past events that dropped from ICS feed
     window_start = now_utc()
@@ -310,40 +645,31 @@ def sync_once():
     # Fetch ICS events (add small lookback for events starting soon)
     ics_fetch_start = window_start - timedelta(days=LOOKBACK_DAYS)
     ics_events = fetch_ics_window(ics_fetch_start, window_end)
-    wanted: Dict[str, Dict] = {}
-    for ev in ics_events:
-        status = (getattr(ev, "status", "") or "").upper()
-        if status in {"CANCELLED", "CANCELED"}:
-            continue
-        uid = getattr(ev, "uid", None) or getattr(ev, "id", None) or ""
-        try:
-            start_dt, end_dt, all_day = normalize_event_times(ev)
-        except Exception as exc:
-            print(f"[warn] skipping event without usable times ({uid}): {exc}")
-            continue
-        
-        # Only sync events that end at or after window_start (filter out past events)
-        event_end = end_dt if isinstance(end_dt, datetime) else datetime.combine(end_dt, datetime.min.time(), tzinfo=timezone.utc)
-        if event_end < window_start:
-            continue
-            
-        key = event_key(uid, start_dt.date() if all_day else start_dt, all_day)
-        wanted[key] = gcal_event_from_ics(ev, key, start_dt, end_dt, all_day)
+    wanted: Dict[str, Dict] = dict(_wanted_iter(ics_events, window_start, window_end))
 
     # Fetch existing mirrored Google events
-    existing = list_existing_mirrors(service, time_min, time_max)
+    existing = list_existing_mirrors(service, window_start, window_end)
     existing_by_key = {}
     for ge in existing:
         k = ge.get("extendedProperties", {}).get("private", {}).get("ics_key")
         if k:
             existing_by_key[k] = ge
 
-    # Upsert
-    created, updated = 0, 0
-    for k, body in wanted.items():
-        if k in existing_by_key:
-            ge = existing_by_key[k]
-            # Build a comparable projection of the existing event
+    to_create = wanted.keys() - existing_by_key.keys()
+    to_delete = existing_by_key.keys() - wanted.keys()
+    to_check = wanted.keys() & existing_by_key.keys()
+
+    patches: List[Tuple[str, str, object]] = []
+    backfills: List[Tuple[str, str, object]] = []
+    for k in to_check:
+        body = wanted[k]
+        ge = existing_by_key[k]
+        existing_hash = ge.get("extendedProperties", {}).get("private", {}).get("ics_hash")
+        if existing_hash:
+            if existing_hash == body["extendedProperties"]["private"]["ics_hash"]:
+                continue
+        else:
+            # Mirrored before hashing was added: fall back to a field-by-field comparison
             projection = {
                 "summary": ge.get("summary"),
                 "location": ge.get("location"),
@@ -359,51 +685,36 @@ def sync_once():
                     "date": ge.get("end", {}).get("date"),
                 },
             }
-            if not compare_relevant(body, projection):
-                try:
-                    execute_with_backoff(
-                        service.events().patch(
-                            calendarId=GOOGLE_CALENDAR_ID,
-                            eventId=ge["id"],
-                            body=body,
-                        ),
-                        f"update event {k}"
-                    )
-                    updated += 1
-                    time.sleep(uniform(0.2, 0.5))
-                except Exception as e:
-                    print(f"[warn] update failed for {k}: {e}")
-        else:
-            try:
-                execute_with_backoff(
-                    service.events().insert(
-                        calendarId=GOOGLE_CALENDAR_ID,
-                        body=body
-                    ),
-                    f"create event {k}"
-                )
-                created += 1
-                time.sleep(uniform(0.2, 0.5))
-            except Exception as e:
-                print(f"[warn] create failed for {k}: {e}")
-
-    # Deletions
-    deleted = 0
-    current_keys = set(wanted.keys())
-    for k, ge in existing_by_key.items():
-        if k not in current_keys:
-            try:
-                execute_with_backoff(
-                    service.events().delete(
-                        calendarId=GOOGLE_CALENDAR_ID,
-                        eventId=ge["id"]
-                    ),
-                    f"delete event {k}"
-                )
-                deleted += 1
-                time.sleep(uniform(0.2, 0.5))
-            except Exception as e:
-                print(f"[warn] delete failed for {k}: {e}")
+            if compare_relevant(body, projection):
+                # Unchanged, but store the hash once so later syncs take the fast path
+                backfills.append(("backfill", k, service.events().patch(
+                    calendarId=GOOGLE_CALENDAR_ID,
+                    eventId=ge["id"],
+                    body={"extendedProperties": body["extendedProperties"]},
+                )))
+                continue
+        patches.append(("update", k, service.events().patch(
+            calendarId=GOOGLE_CALENDAR_ID,
+            eventId=ge["id"],
+            body=body,
+        )))
+
+    inserts = [
+        ("create", k, service.events().insert(calendarId=GOOGLE_CALENDAR_ID, body=wanted[k]))
+        for k in to_create
+    ]
+    deletes = [
+        ("delete", k, service.events().delete(calendarId=GOOGLE_CALENDAR_ID, eventId=existing_by_key[k]["id"]))
+        for k in to_delete
+    ]
+
+    # Each operation type goes out in its own batches
+    created = execute_batched(service, inserts)["create"]
+    updated = execute_batched(service, patches)["update"]
+    deleted = execute_batched(service, deletes)["delete"]
+    if backfills:
+        backfilled = execute_batched(service, backfills)["backfill"]
+        print(f"[sync] stored ics_hash on {backfilled} previously mirrored events")
 
     print(f"[sync] created={created} updated={updated} deleted={deleted} in_window={len(wanted)}")
     return created, updated, deleted
@@ -420,9 +731,12 @@ def record_sync_result(created: int, updated: int, deleted: int, error: Exceptio
         pass  # Web admin might not be running
 
 if __name__ == "__main__":
+    # Reuse one Calendar client across polls; it is only rebuilt once its token stops being valid
+    service = None
     while True:
         try:
-            created, updated, deleted = sync_once()
+            service = ensure_service(service)
+            created, updated, deleted = sync_once(service)
             record_sync_result(created, updated, deleted)
         except Exception as e:
             print(f"[error] {e}")
@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+import orjson
+
+
+# os.umask can only be read by setting it, so do that once at import rather than while
+# other threads may be creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _default_mode(path: str) -> int:
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def write_json_atomic(path: str, data, option: int = 0):
+    """Write JSON next to `path` and rename it into place so readers never see a torn file.
+
+    The temp file name is unique, so the sync and web processes can both write
+    the same file without clobbering each other's in-progress write.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        # mkstemp creates 0600 files; keep the mode a plain open() would have given
+        os.fchmod(fd, _default_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
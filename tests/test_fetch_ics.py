@@ -0,0 +1,86 @@
+"""Smoke check: fetch_ics_window downloads, parses and caches a real ICS payload."""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+ICS_TEMPLATE = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//ics-bridge//smoke//EN
+BEGIN:VEVENT
+UID:single@example.com
+DTSTAMP:{stamp}
+DTSTART:{start}
+DTEND:{end}
+SUMMARY:Assembly
+END:VEVENT
+BEGIN:VEVENT
+UID:weekly@example.com
+DTSTAMP:{stamp}
+DTSTART:{start}
+DTEND:{end}
+RRULE:FREQ=WEEKLY;COUNT=3
+SUMMARY:Maths
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    body = b""
+    etag = '"v1"'
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/calendar")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = HTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/calendar.ics"
+    server.shutdown()
+
+
+def test_fetch_ics_window_parses_and_caches(feed_server, monkeypatch):
+    monkeypatch.setenv("ICS_URL", feed_server)
+    import main
+
+    monkeypatch.setattr(main, "ICS_URL", feed_server)
+    main._ics_cache.update({k: None for k in main._ics_cache})
+
+    start = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    fmt = "%Y%m%dT%H%M%SZ"
+    FeedHandler.body = ICS_TEMPLATE.format(
+        stamp=start.strftime(fmt),
+        start=start.strftime(fmt),
+        end=(start + timedelta(hours=1)).strftime(fmt),
+    ).replace("\n", "\r\n").encode("utf-8")
+
+    window_start = datetime.now(timezone.utc)
+    window_end = window_start + timedelta(days=30)
+    events = main.fetch_ics_window(window_start, window_end)
+
+    # One single event plus three weekly occurrences
+    assert sorted(ev.summary for ev in events) == ["Assembly", "Maths", "Maths", "Maths"]
+
+    # Second poll gets a 304 and reuses the parsed events
+    assert main.fetch_ics_window(window_start, window_end) is events
+    assert FeedHandler.requests == 2
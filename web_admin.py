@@ -1,10 +1,13 @@
 import os
-import json
+import queue
 import threading
+import orjson
+from collections import deque
 from datetime import datetime, timezone
-from flask import Flask, render_template_string, jsonify, request, session, redirect, url_for
+from flask import Flask, Response, render_template_string, jsonify, request, session, redirect, url_for
 from functools import wraps
-from main import sync_once
+
+from storage import write_json_atomic
 
 DATA_DIR = os.path.abspath("./data")
 HISTORY_PATH = os.path.join(DATA_DIR, "sync_history.json")
@@ -12,7 +15,21 @@ ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "admin")
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", os.urandom(24).hex())
-sync_lock = threading.Lock()
+# Manual syncs run on one worker thread: at most one in flight plus one queued follow-up.
+# Requests arriving while a follow-up is already queued return immediately as coalesced.
+_sync_queue = queue.Queue(maxsize=1)
+# How long a request waits for its own sync before answering that it is still running
+SYNC_WAIT_SECONDS = 60
+_queue_lock = threading.Lock()
+_sync_worker = None
+# Calendar client reused across manual syncs; only touched by the worker thread
+_service = None
+
+HISTORY_LIMIT = 100
+# In-memory copy of the history file (main.py writes it from another process). Every write is an
+# atomic replace, so (mtime, inode, size) changes even when two writes land in the same clock tick.
+_hist_cache = {"version": "0", "data": deque(maxlen=HISTORY_LIMIT)}
+_hist_lock = threading.RLock()
 
 def require_auth(f):
     @wraps(f)
@@ -22,19 +39,32 @@ def require_auth(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def history_version() -> str:
+    st = os.stat(HISTORY_PATH)
+    return f"{st.st_mtime_ns}-{st.st_ino}-{st.st_size}"
+
 def load_history():
-    if os.path.exists(HISTORY_PATH):
-        with open(HISTORY_PATH, "r") as f:
-            return json.load(f)
-    return []
+    """Return (version, records) for the sync history, re-reading the file only when it changes.
+
+    Both values are taken under the same lock so the version always describes the records.
+    """
+    with _hist_lock:
+        try:
+            version = history_version()
+        except FileNotFoundError:
+            _hist_cache["version"] = "0"
+            _hist_cache["data"].clear()
+            return "0", []
+        if version != _hist_cache["version"]:
+            with open(HISTORY_PATH, "rb") as f:
+                _hist_cache["data"] = deque(orjson.loads(f.read()), maxlen=HISTORY_LIMIT)
+            _hist_cache["version"] = version
+        return _hist_cache["version"], list(_hist_cache["data"])
 
 def save_history(history):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(HISTORY_PATH, "w") as f:
-        json.dump(history[-100:], f, indent=2)
+    write_json_atomic(HISTORY_PATH, list(history)[-HISTORY_LIMIT:], option=orjson.OPT_INDENT_2)
 
 def add_sync_record(success, created=0, updated=0, deleted=0, error_msg=None):
-    history = load_history()
     record = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "success": success,
@@ -43,8 +73,11 @@ def add_sync_record(success, created=0, updated=0, deleted=0, error_msg=None):
         "deleted": deleted,
         "error": error_msg
     }
-    history.append(record)
-    save_history(history)
+    with _hist_lock:
+        load_history()  # pick up records written by the other process
+        _hist_cache["data"].append(record)
+        save_history(_hist_cache["data"])
+        _hist_cache["version"] = history_version()
     return record
 
 LOGIN_TEMPLATE = """
@@ -302,9 +335,14 @@ HTML_TEMPLATE = """
             fetch('/api/sync', { method: 'POST' })
                 .then(r => r.json())
                 .then(data => {
-                    if (data.success) {
+                    if (data.success && !data.coalesced && !data.running) {
                         status.className = 'status success';
                         status.textContent = `✓ Sync complete! Added: ${data.created}, Updated: ${data.updated}, Removed: ${data.deleted}`;
+                    } else if (data.coalesced || data.running) {
+                        status.className = 'status success';
+                        status.textContent = data.coalesced
+                            ? '⏳ A sync is already queued; results will appear in the history below'
+                            : '⏳ Sync still running; results will appear in the history below';
                     } else {
                         status.className = 'status error';
                         status.textContent = `✗ Sync failed: ${data.error}`;
@@ -328,6 +366,9 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# The dashboard has no template variables, so encode it once instead of rendering per request
+_INDEX_BYTES = HTML_TEMPLATE.encode("utf-8")
+
 @app.route("/health")
 def health():
     return jsonify({"status": "healthy"}), 200
@@ -350,42 +391,85 @@ def logout():
 @app.route("/")
 @require_auth
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    resp = Response(_INDEX_BYTES, mimetype="text/html")
+    resp.headers["Cache-Control"] = "private, max-age=300"
+    return resp
 
 @app.route("/api/history")
 @require_auth
 def get_history():
-    return jsonify(load_history())
+    version, history = load_history()
+    resp = jsonify(history)
+    # Let the dashboard's 10s poll revalidate with If-None-Match and get a 304 when nothing changed
+    resp.set_etag(version)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+class SyncJob:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+def record_sync_safely(*args, **kwargs):
+    # A broken history file must not take the sync worker down with it
+    try:
+        return add_sync_record(*args, **kwargs)
+    except Exception as e:
+        print(f"[web] failed to record sync result: {e}")
+        return None
+
+def run_sync_worker():
+    global _service
+
+    while True:
+        job = _sync_queue.get()
+        try:
+            # Imported on first use so the idle admin process doesn't load the Google/ICS clients
+            from main import ensure_service, sync_once
+
+            _service = ensure_service(_service)
+            created, updated, deleted = sync_once(_service)
+        except Exception as e:
+            error_msg = str(e) or type(e).__name__
+            record_sync_safely(False, error_msg=error_msg)
+            job.result = ({"success": False, "error": error_msg}, 500)
+        else:
+            record = record_sync_safely(True, created, updated, deleted)
+            job.result = ({
+                "success": True,
+                "created": created,
+                "updated": updated,
+                "deleted": deleted,
+                "timestamp": record["timestamp"] if record else datetime.now(timezone.utc).isoformat()
+            }, 200)
+        finally:
+            job.done.set()
 
 @app.route("/api/sync", methods=["POST"])
 @require_auth
 def trigger_sync():
-    if not sync_lock.acquire(blocking=False):
-        return jsonify({"success": False, "error": "Sync already in progress"}), 409
-    
-    try:
-        created, updated, deleted = sync_once()
-        record = add_sync_record(True, created, updated, deleted)
-        return jsonify({
-            "success": True,
-            "created": created,
-            "updated": updated,
-            "deleted": deleted,
-            "timestamp": record["timestamp"]
-        })
-    except Exception as e:
-        error_msg = str(e)
-        add_sync_record(False, error_msg=error_msg)
-        return jsonify({"success": False, "error": error_msg}), 500
-    finally:
-        sync_lock.release()
+    global _sync_worker
+    with _queue_lock:
+        if _sync_worker is None or not _sync_worker.is_alive():
+            _sync_worker = threading.Thread(target=run_sync_worker, name="sync-worker", daemon=True)
+            _sync_worker.start()
+        job = SyncJob()
+        try:
+            _sync_queue.put_nowait(job)
+        except queue.Full:
+            # A follow-up sync is already queued and will pick up whatever prompted this click
+            return jsonify({"success": True, "coalesced": True})
+
+    if not job.done.wait(SYNC_WAIT_SECONDS):
+        return jsonify({"success": True, "running": True}), 202
+    if job.result is None:
+        # The worker exited mid-job (SystemExit and the like); it is restarted on the next request
+        return jsonify({"success": False, "error": "Sync worker stopped unexpectedly"}), 500
+    body, status = job.result
+    return jsonify(body), status
 
 if __name__ == "__main__":
     port = int(os.environ.get("WEB_PORT", "8080"))
-    try:
-        from waitress import serve
-        print(f"[web] Starting production server on port {port}")
-        serve(app, host="0.0.0.0", port=port, threads=4)
-    except ImportError:
-        print(f"[web] Starting development server on port {port}")
-        app.run(host="0.0.0.0", port=port, debug=False)
+    from waitress import serve
+    print(f"[web] Starting production server on port {port}")
+    serve(app, host="0.0.0.0", port=port, threads=4)